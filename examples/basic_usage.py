@@ -22,15 +22,37 @@ class SampleDataManager:
             {"id": 2, "name": "Sample Item 2", "type": "demo"},
             {"id": 3, "name": "Another Item", "type": "example"}
         ]
+        # Indexes built once so lookups don't rescan the data
+        self._by_id = {item["id"]: item for item in self.data}
+        self._lc_names = [(item["name"].lower(), item) for item in self.data]
+        self._search_index = None  # trigram -> positions in self.data, see ensure_search_index
+    
+    def ensure_search_index(self):
+        """Build the trigram index used by search_items (called by DataToolsCollection)"""
+        if self._search_index is None:
+            index = {}
+            for position, (name, _) in enumerate(self._lc_names):
+                for i in range(len(name) - 2):
+                    index.setdefault(name[i:i + 3], set()).add(position)
+            self._search_index = index
     
     def get_all_items(self):
         return self.data
     
     def get_item_by_id(self, item_id):
-        return next((item for item in self.data if item["id"] == int(item_id)), None)
+        return self._by_id.get(int(item_id))
     
     def search_items(self, query):
-        return [item for item in self.data if query.lower() in item["name"].lower()]
+        q = query.lower()
+        
+        # Any match must contain every trigram of the query, so only those items are checked
+        if self._search_index is not None and len(q) >= 3:
+            postings = [self._search_index.get(q[i:i + 3], set()) for i in range(len(q) - 2)]
+            positions = set.intersection(*postings)
+            return [self._lc_names[i][1] for i in sorted(positions) if q in self._lc_names[i][0]]
+        
+        # Queries shorter than a trigram still need the full scan
+        return [item for name, item in self._lc_names if q in name]
 
 class SampleContentManager:
     def __init__(self):
@@ -0,0 +1 @@
+from .core.fastpath import fastpath
@@ -2,21 +2,53 @@
 MCP Ollama Chat Interface
 Provides a professional terminal chat experience with function calling
 """
-import ollama
 import json
 import os
 import time
 import sys
-from datetime import datetime
+import hashlib
+import threading
+from collections import OrderedDict, deque
 from typing import Dict, List, Any, Optional
 
+class _Spinner:
+    """Thinking animation that runs while a request is in flight"""
+    frames = ["🤔", "💭", "🧠", "💡"]
+    
+    def __init__(self, interval=0.3):
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        print("\r" + " " * 30 + "\r", end="", flush=True)
+    
+    def _run(self):
+        i = 0
+        while not self._stop_event.is_set():
+            print(f"\r{self.frames[i % len(self.frames)]} Analyzing your request...", end="", flush=True)
+            i += 1
+            self._stop_event.wait(self.interval)
+
 class MCPOllamaChat:
-    def __init__(self, model="llama3.1"):
+    def __init__(self, model="llama3.1", stream=False):
         self.model = model
-        self.client = ollama.Client()
-        self.conversation_history = []
+        self.stream = stream  # Print the final answer token-by-token as it arrives
+        self._client = None  # Created on first use, see client property
+        self.conversation_history = deque(maxlen=200)  # Oldest turns are dropped
         self._cached_data = {}
         
+        # LRU cache of plain (no tool call) LLM responses
+        self._llm_cache = OrderedDict()
+        self._llm_cache_maxsize = 128
+        
         # Terminal colors for professional UX
         self.colors = {
             'blue': '\033[94m', 'green': '\033[92m', 'yellow': '\033[93m',
@@ -24,19 +56,58 @@ class MCPOllamaChat:
             'white': '\033[97m', 'bold': '\033[1m', 'underline': '\033[4m',
             'end': '\033[0m', 'dim': '\033[2m'
         }
+        self._wrap = {name: (code, self.colors['end']) for name, code in self.colors.items()}
+        
+        self._ts_cache = (0, '')  # (epoch second, formatted time)
+        
+        # Function call log layout, built once so logging is a single %-format
+        C, E = self.colors['cyan'], self.colors['end']
+        self._cyan_bar = self._colorize('│', 'cyan')
+        self._payload_prefix = f"{C}│  {self.colors['dim']}"
+        self._param_line_template = f"{C}│  • %s:{E} {self.colors['yellow']}%s{E}"
+        self._params_header = f"{C}├─ Parameters:{E}"
+        self._no_params_line = f"{C}├─ Parameters:{E} {self.colors['dim']}None{E}"
+        self._call_log_template = "\n".join([
+            f"\n{C}┌─ Function Call #%(n)s/%(total)s{E}",
+            self._cyan_bar,
+            f"{C}├─ Function:{E} {self.colors['bold']}%(name)s{E}",
+            f"{C}├─ Description:{E} %(description)s",
+            "%(parameters)s",
+            self._cyan_bar,
+            f"{C}├─ MCP Payload Structure:{E}",
+            "%(payload)s",
+            self._cyan_bar,
+            f"{C}└─ Executing...{E}",
+        ])
         
         # Will be populated by tool collections
         self.available_functions = {}
         self.function_descriptions = {}
         self.tool_schemas = []
+        self._tool_schemas_json = None
         
+    @property
+    def client(self):
+        """Ollama client, imported lazily so help/tools commands start fast"""
+        if self._client is None:
+            import ollama
+            self._client = ollama.Client()
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        """Use a specific client, e.g. ollama.Client(host=...) for a non-default host"""
+        self._client = client
+        # Responses cached from the previous client may not match the new one
+        self._llm_cache.clear()
+
     def register_tool_collection(self, collection_name: str, tool_collection):
         """Register a tool collection with the chat interface"""
         manifest = tool_collection.get_tool_manifest()
         
         for tool in manifest.get("tools", []):
             tool_name = tool["name"]
-            self.available_functions[tool_name] = lambda tc=tool_collection, tn=tool_name, **kwargs: tc.execute_tool(tn, kwargs)
+            self.available_functions[tool_name] = (tool_collection, tool_name)
             self.function_descriptions[tool_name] = tool["description"]
             
             # Convert to Ollama function schema
@@ -49,54 +120,52 @@ class MCPOllamaChat:
                 }
             }
             self.tool_schemas.append(schema)
+        
+        self._tool_schemas_json = None
     
     # UI Helper Methods
     def _colorize(self, text: str, color: str) -> str:
-        return f"{self.colors.get(color, '')}{text}{self.colors['end']}"
+        pre, post = self._wrap.get(color, ('', self.colors['end']))
+        return f"{pre}{text}{post}"
     
     def _print_timestamp(self):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"{self.colors['dim']}[{timestamp}]{self.colors['end']}", end=" ")
-    
-    def _animate_thinking(self, duration=1.5):
-        frames = ["🤔", "💭", "🧠", "💡"]
-        end_time = time.time() + duration
-        i = 0
-        while time.time() < end_time:
-            print(f"\r{frames[i % len(frames)]} Analyzing your request...", end="", flush=True)
-            time.sleep(0.3)
-            i += 1
-        print("\r" + " " * 30 + "\r", end="", flush=True)
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        print(f"{self.colors['dim']}[{self._ts_cache[1]}]{self.colors['end']}", end=" ")
     
     def _log_function_call(self, function_name: str, arguments: dict, step_num: int, total_steps: int):
-        print(f"\n{self.colors['cyan']}┌─ Function Call #{step_num}/{total_steps}{self.colors['end']}")
-        print(f"{self.colors['cyan']}│{self.colors['end']}")
-        print(f"{self.colors['cyan']}├─ Function:{self.colors['end']} {self.colors['bold']}{function_name}{self.colors['end']}")
-        print(f"{self.colors['cyan']}├─ Description:{self.colors['end']} {self.function_descriptions.get(function_name, 'No description')}")
-        
         if arguments:
-            print(f"{self.colors['cyan']}├─ Parameters:{self.colors['end']}")
-            for key, value in arguments.items():
-                print(f"{self.colors['cyan']}│  • {key}:{self.colors['end']} {self.colors['yellow']}{value}{self.colors['end']}")
+            parameters = "\n".join([self._params_header] + [
+                self._param_line_template % (key, value) for key, value in arguments.items()
+            ])
         else:
-            print(f"{self.colors['cyan']}├─ Parameters:{self.colors['end']} {self.colors['dim']}None{self.colors['end']}")
+            parameters = self._no_params_line
         
-        print(f"{self.colors['cyan']}│{self.colors['end']}")
-        print(f"{self.colors['cyan']}├─ MCP Payload Structure:{self.colors['end']}")
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "tools/call",
-            "params": {
-                "name": function_name,
-                "arguments": arguments if arguments else {}
-            }
-        }
-        payload_json = json.dumps(payload, indent=2)
-        for line in payload_json.split('\n'):
-            print(f"{self.colors['cyan']}│  {self.colors['dim']}{line}{self.colors['end']}")
+        # Fixed JSON-RPC envelope, only the name and arguments are serialized
+        arguments_json = json.dumps(arguments or {}, indent=2).replace('\n', '\n    ')
+        payload_json = (
+            '{\n'
+            '  "jsonrpc": "2.0",\n'
+            '  "method": "tools/call",\n'
+            '  "params": {\n'
+            f'    "name": {json.dumps(function_name)},\n'
+            f'    "arguments": {arguments_json}\n'
+            '  }\n'
+            '}'
+        )
+        end = self.colors['end']
+        payload = "\n".join(f"{self._payload_prefix}{line}{end}" for line in payload_json.split('\n'))
         
-        print(f"{self.colors['cyan']}│{self.colors['end']}")
-        print(f"{self.colors['cyan']}└─ Executing...{self.colors['end']}", end="", flush=True)
+        sys.stdout.write(self._call_log_template % {
+            'n': step_num,
+            'total': total_steps,
+            'name': function_name,
+            'description': self.function_descriptions.get(function_name, 'No description'),
+            'parameters': parameters,
+            'payload': payload,
+        })
+        sys.stdout.flush()
     
     def _log_function_result(self, success: bool, message: str, data_summary: str = None):
         if success:
@@ -107,12 +176,40 @@ class MCPOllamaChat:
             print(f" {self.colors['red']}❌ Failed{self.colors['end']}")
             print(f"   {self.colors['red']}└─{self.colors['end']} {message}")
     
+    def _llm_cache_key(self, system_prompt: str, message: str) -> str:
+        if self._tool_schemas_json is None:
+            self._tool_schemas_json = json.dumps(self.tool_schemas, sort_keys=True, default=str)
+        key_data = json.dumps([self.model, system_prompt, message])
+        return hashlib.md5(f"{key_data}{self._tool_schemas_json}".encode()).hexdigest()
+    
+    def _llm_cache_put(self, key: str, content: str):
+        self._llm_cache[key] = content
+        self._llm_cache.move_to_end(key)
+        if len(self._llm_cache) > self._llm_cache_maxsize:
+            self._llm_cache.popitem(last=False)
+    
+    def _stream_chat(self, messages: list) -> str:
+        """Stream a completion to the terminal and return the full text"""
+        content_parts = []
+        for chunk in self.client.chat(model=self.model, messages=messages, stream=True):
+            content = chunk['message']['content']
+            content_parts.append(content)
+            sys.stdout.write(content)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
+        return "".join(content_parts)
+    
     def _get_data_summary(self, function_result: dict) -> str:
         """Generate summary from MCP response"""
         try:
             if function_result.get("isError"):
                 return f"Error occurred"
             
+            # Tools that already know the count can skip the JSON parse below
+            count = function_result.get("meta", {}).get("count")
+            if count is not None:
+                return f"Found {count} items"
+            
             content = function_result.get("content", [])
             if content and len(content) > 0:
                 text_content = content[0].get("text", "")
@@ -144,25 +241,39 @@ class MCPOllamaChat:
             self._list_available_tools()
             return ""
         
-        self.conversation_history.append({"role": "user", "content": message})
-        
         default_prompt = "You are a helpful assistant with access to various tools and functions. Use the available tools to help users with their requests."
         
+        # One message list for the whole turn, tool results are appended to it
+        user_message = {'role': 'user', 'content': message}
+        messages = [
+            {'role': 'system', 'content': system_prompt or default_prompt},
+            user_message
+        ]
+        self.conversation_history.append(user_message)
+        
         try:
             self._print_timestamp()
-            self._animate_thinking()
             
-            response = self.client.chat(
-                model=self.model,
-                messages=[{
-                    'role': 'system',
-                    'content': system_prompt or default_prompt
-                }, {
-                    'role': 'user', 
-                    'content': message
-                }],
-                tools=self.tool_schemas,
-            )
+            # Repeated questions that didn't need tools can skip the round-trip
+            cache_key = self._llm_cache_key(system_prompt or default_prompt, message)
+            cached_content = self._llm_cache.get(cache_key)
+            if cached_content is not None:
+                self._llm_cache.move_to_end(cache_key)
+                print(f"{self.colors['blue']}💭 Responding from cache...{self.colors['end']}\n")
+                self.conversation_history.append({"role": "assistant", "content": cached_content})
+                return cached_content
+            
+            # Animate while the model works instead of before it
+            spinner = _Spinner()
+            spinner.start()
+            try:
+                response = self.client.chat(
+                    model=self.model,
+                    messages=messages,
+                    tools=self.tool_schemas,
+                )
+            finally:
+                spinner.stop()
 
             if response.get('message', {}).get('tool_calls'):
                 tool_calls = response['message']['tool_calls']
@@ -170,11 +281,7 @@ class MCPOllamaChat:
                 print(f"{self.colors['bold']}🔧 Function Calling Required{self.colors['end']}")
                 print(f"Ollama determined {self.colors['yellow']}{len(tool_calls)}{self.colors['end']} function call{'s' if len(tool_calls) > 1 else ''} needed:")
                 
-                messages = [
-                    {'role': 'system', 'content': system_prompt or default_prompt},
-                    {'role': 'user', 'content': message},
-                    response['message']
-                ]
+                messages.append(response['message'])
                 
                 for i, tool_call in enumerate(tool_calls):
                     try:
@@ -188,7 +295,8 @@ class MCPOllamaChat:
                         
                         if function_name in self.available_functions:
                             start_time = time.time()
-                            function_result = self.available_functions[function_name](**function_args)
+                            tool_collection, tool_name = self.available_functions[function_name]
+                            function_result = tool_collection.execute_tool(tool_name, function_args)
                             execution_time = time.time() - start_time
                             
                             # Handle MCP response format
@@ -233,14 +341,21 @@ class MCPOllamaChat:
                 
                 print(f"\n{self.colors['purple']}🧠 Processing Results & Generating Response...{self.colors['end']}")
                 
-                final_response = self.client.chat(model=self.model, messages=messages)
-                self.conversation_history.append({"role": "assistant", "content": final_response['message']['content']})
+                if self.stream:
+                    print()
+                    final_content = self._stream_chat(messages)
+                else:
+                    final_response = self.client.chat(model=self.model, messages=messages)
+                    final_content = final_response['message']['content']
+                self.conversation_history.append({"role": "assistant", "content": final_content})
                 
                 print(f"\n{self.colors['green']}✨ Response Ready!{self.colors['end']}\n")
-                return final_response['message']['content']
+                return final_content
             
             print(f"{self.colors['blue']}💭 Responding from knowledge...{self.colors['end']}\n")
             self.conversation_history.append({"role": "assistant", "content": response['message']['content']})
+            # Only cache responses without tool calls, tool calls have side effects
+            self._llm_cache_put(cache_key, response['message']['content'])
             return response['message']['content']
             
         except Exception as e:
@@ -3,10 +3,17 @@ Simple configuration management for MCP Toolkit
 Config file stored in project root for easy access
 """
 import os
-import json
+import re
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+from ..utils.fastjson import dumps_bytes, loads
+
+# Markers left in the template config that mean a value still needs filling in
+_PLACEHOLDER_RE = re.compile(r'PUT_YOUR_|your_actual_|REPLACE_|ADD_YOUR_|example\.com|localhost')
+# Fields every environment's oauth section must fill in
+_REQUIRED_OAUTH_FIELDS = ("client_id", "client_secret", "token_url")
+
 class ConfigManager:
     def __init__(self, config_file: str = None):
         # Default to project root directory
@@ -18,14 +25,16 @@ class ConfigManager:
             self.config_file = os.path.join(current_dir, "mcp_config.json")
         
         self.config = {}
+        # (environment, required field values) -> fields still needing setup
+        self._oauth_validation_cache = {}
         self.load_config()
     
     def load_config(self):
         """Load configuration from file"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    self.config = loads(f.read())
                 print(f"📋 Loaded config from: {self.config_file}")
             except Exception as e:
                 print(f"⚠️  Could not load config file {self.config_file}: {e}")
@@ -112,17 +121,14 @@ class ConfigManager:
         env_config = self.config.get("environments", {}).get(env, {})
         oauth_config = env_config.get("oauth", {})
         
-        # Check for placeholder values
-        placeholder_indicators = [
-            "PUT_YOUR_", "your_actual_", "REPLACE_", "ADD_YOUR_", 
-            "example.com", "localhost", ""
-        ]
-        
-        issues = []
-        for field in ["client_id", "client_secret", "token_url"]:
-            value = oauth_config.get(field, "")
-            if not value or any(indicator in str(value) for indicator in placeholder_indicators):
-                issues.append(field)
+        # Only the required fields are validated, so key the result on their values
+        values = tuple(oauth_config.get(field, "") for field in _REQUIRED_OAUTH_FIELDS)
+        issues = self._oauth_validation_cache.get((env, values))
+        if issues is None:
+            # Check for missing or placeholder values
+            issues = [field for field, value in zip(_REQUIRED_OAUTH_FIELDS, values)
+                      if not value or _PLACEHOLDER_RE.search(str(value))]
+            self._oauth_validation_cache[(env, values)] = issues
         
         if issues:
             raise ValueError(
@@ -143,8 +149,8 @@ class ConfigManager:
     def save_config(self):
         """Save current configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            with open(self.config_file, 'wb') as f:
+                f.write(dumps_bytes(self.config))
             print(f"💾 Config saved to: {self.config_file}")
         except Exception as e:
             print(f"⚠️  Could not save config file: {e}")
@@ -154,8 +160,8 @@ class ConfigManager:
         config = self._get_default_config()
         
         # Create the config file
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        with open(self.config_file, 'wb') as f:
+            f.write(dumps_bytes(config))
         
         print(f"✅ Config file created: {self.config_file}")
         print(f"")
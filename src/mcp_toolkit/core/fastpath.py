@@ -0,0 +1,16 @@
+"""
+Optional JIT compilation for numeric tool code
+Uses numba when it is installed and falls back to plain Python otherwise
+"""
+
+def fastpath(fn):
+    """Compile a numeric function with numba.njit if numba is available
+
+    Only use this on functions numba can compile (loops over numbers and
+    NumPy arrays). Compiled code is cached on disk so the JIT cost is paid once.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return fn
+    return njit(cache=True, fastmath=True)(fn)
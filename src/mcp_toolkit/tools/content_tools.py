@@ -1,59 +1,53 @@
 """
 Generic content management tools following MCP standards
 """
-import json
-from typing import Dict, List, Any
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from ..utils.fastjson import dumps, dumps_compact
+from ..utils.mcp_response import mcp_error_envelope, text_response
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Any, ClassVar
 
 class ContentToolsCollection:
-    def __init__(self, content_manager):
+    __slots__ = ("content_manager", "_dumps", "_dispatch")
+    
+    # Built once at class definition, the manifest never changes
+    _MANIFEST: ClassVar[Dict[str, Any]] = {
+        "tools": [
+            {
+                "name": "get_content_items",
+                "description": "Retrieve all content items",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            }
+        ]
+    }
+    
+    def __init__(self, content_manager, pretty: bool = False):
         self.content_manager = content_manager
+        self._dumps = dumps if pretty else dumps_compact  # Indented JSON only for humans
+        self._dispatch = {
+            "get_content_items": self._handle_get_content_items
+        }
         
     def get_tool_manifest(self) -> Dict[str, Any]:
         """Return MCP-compliant tool manifest"""
-        return {
-            "tools": [
-                {
-                    "name": "get_content_items",
-                    "description": "Retrieve all content items",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            ]
-        }
+        return self._MANIFEST
     
     def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a content tool with MCP-compliant response"""
-        try:
-            if tool_name == "get_content_items":
-                content = self.content_manager.get_content_items()
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({"content": content, "count": len(content)}, indent=2)
-                        }
-                    ]
-                }
-            else:
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({"error": f"Unknown tool: {tool_name}"}, indent=2)
-                        }
-                    ],
-                    "isError": True
-                }
-        except Exception as e:
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": json.dumps({"error": str(e)}, indent=2)
-                    }
-                ],
-                "isError": True
-                }
\ No newline at end of file
+        handler = self._dispatch.get(tool_name)
+        if handler:
+            return handler(arguments)
+        return text_response(self._dumps({"error": f"Unknown tool: {tool_name}"}), is_error=True)
+    
+    @mcp_error_envelope()
+    def _handle_get_content_items(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        content = self.content_manager.get_content_items()
+        return text_response(self._dumps({"content": content, "count": len(content)}),
+                             meta={"count": len(content)})
\ No newline at end of file
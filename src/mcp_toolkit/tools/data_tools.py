@@ -1,113 +1,103 @@
 """
 Generic data access tools following MCP standards
 """
-import json
-from typing import Dict, List, Any
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from ..utils.fastjson import dumps, dumps_compact
+from ..utils.mcp_response import mcp_error_envelope, text_response
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Any, ClassVar
 
 class DataToolsCollection:
-    def __init__(self, data_manager):
+    __slots__ = ("data_manager", "_dumps", "_dispatch")
+    
+    # Built once at class definition, the manifest never changes
+    _MANIFEST: ClassVar[Dict[str, Any]] = {
+        "tools": [
+            {
+                "name": "get_all_items",
+                "description": "Retrieve all available data items",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            },
+            {
+                "name": "get_item_by_id",
+                "description": "Get specific item by ID",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "item_id": {
+                            "type": "string",
+                            "description": "Unique identifier for the item"
+                        }
+                    },
+                    "required": ["item_id"]
+                }
+            },
+            {
+                "name": "search_items",
+                "description": "Search items by query",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Search query string"
+                        }
+                    },
+                    "required": ["query"]
+                }
+            }
+        ]
+    }
+    
+    def __init__(self, data_manager, pretty: bool = False):
         self.data_manager = data_manager
+        # Let managers that support it index their data for search_items up front
+        ensure_search_index = getattr(data_manager, "ensure_search_index", None)
+        if ensure_search_index is not None:
+            ensure_search_index()
+        self._dumps = dumps if pretty else dumps_compact  # Indented JSON only for humans
+        self._dispatch = {
+            "get_all_items": self._handle_get_all_items,
+            "get_item_by_id": self._handle_get_item_by_id,
+            "search_items": self._handle_search_items
+        }
         
     def get_tool_manifest(self) -> Dict[str, Any]:
         """Return MCP-compliant tool manifest"""
-        return {
-            "tools": [
-                {
-                    "name": "get_all_items",
-                    "description": "Retrieve all available data items",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                },
-                {
-                    "name": "get_item_by_id",
-                    "description": "Get specific item by ID",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "item_id": {
-                                "type": "string",
-                                "description": "Unique identifier for the item"
-                            }
-                        },
-                        "required": ["item_id"]
-                    }
-                },
-                {
-                    "name": "search_items",
-                    "description": "Search items by query",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query string"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                }
-            ]
-        }
+        return self._MANIFEST
     
     def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a tool with MCP-compliant response"""
-        try:
-            if tool_name == "get_all_items":
-                data = self.data_manager.get_all_items()
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({"items": data, "count": len(data)}, indent=2)
-                        }
-                    ]
-                }
-            elif tool_name == "get_item_by_id":
-                item_id = arguments.get("item_id")
-                item = self.data_manager.get_item_by_id(item_id)
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({"item": item}, indent=2)
-                        }
-                    ]
-                }
-            elif tool_name == "search_items":
-                query = arguments.get("query", "")
-                results = self.data_manager.search_items(query)
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({
-                                "query": query,
-                                "results": results,
-                                "count": len(results)
-                            }, indent=2)
-                        }
-                    ]
-                }
-            else:
-                return {
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": json.dumps({"error": f"Unknown tool: {tool_name}"}, indent=2)
-                        }
-                    ],
-                    "isError": True
-                }
-        except Exception as e:
-            return {
-                "content": [
-                    {
-                        "type": "text",
-                        "text": json.dumps({"error": str(e)}, indent=2)
-                    }
-                ],
-                "isError": True
-            }
\ No newline at end of file
+        handler = self._dispatch.get(tool_name)
+        if handler:
+            return handler(arguments)
+        return text_response(self._dumps({"error": f"Unknown tool: {tool_name}"}), is_error=True)
+    
+    @mcp_error_envelope()
+    def _handle_get_all_items(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        data = self.data_manager.get_all_items()
+        return text_response(self._dumps({"items": data, "count": len(data)}),
+                             meta={"count": len(data)})
+    
+    @mcp_error_envelope()
+    def _handle_get_item_by_id(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        item_id = arguments.get("item_id")
+        item = self.data_manager.get_item_by_id(item_id)
+        return text_response(self._dumps({"item": item}))
+    
+    @mcp_error_envelope()
+    def _handle_search_items(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        query = arguments.get("query", "")
+        results = self.data_manager.search_items(query)
+        return text_response(self._dumps({
+            "query": query,
+            "results": results,
+            "count": len(results)
+        }), meta={"count": len(results)})
\ No newline at end of file
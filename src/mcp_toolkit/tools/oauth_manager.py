@@ -1,21 +1,166 @@
 """
 Standard OAuth2 implementation
 """
-import requests
 import base64
+import threading
 import time
 import json
 from typing import Dict, Any
 
+# Refresh tokens this many seconds before they actually expire
+TOKEN_EXPIRY_SKEW = 30
+# Background refresh runs this many seconds before expiry so callers never wait on it
+BACKGROUND_REFRESH_LEAD = 60
+
 class OAuth2Manager:
-    def __init__(self, client_id: str, client_secret: str, token_url: str, 
+    __slots__ = ("client_id", "client_secret", "token_url", "auth_url", "redirect_uri",
+                 "_token_headers", "_cached_token", "_token_expires_at", "_session",
+                 "_lock", "_fetch_locks", "_refresh_timers", "_read_since_fetch", "_closed")
+
+    def __init__(self, client_id: str, client_secret: str, token_url: str,
                  auth_url: str = None, redirect_uri: str = None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.token_url = token_url
         self.auth_url = auth_url
         self.redirect_uri = redirect_uri
-        self._cached_token = None
-        self._token_expires_at = None
-    
-    # ... (keep all the existing OAuth2Manager methods from before)
\ No newline at end of file
+
+        # Client credentials never change, so the Basic auth header is encoded once
+        credentials = f"{client_id}:{client_secret}".encode()
+        self._token_headers = {
+            "Authorization": "Basic " + base64.b64encode(credentials).decode(),
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+
+        self._cached_token = {}  # (grant_type, scope) -> token response
+        self._token_expires_at = {}  # (grant_type, scope) -> expiry timestamp
+        self._session = None  # Created on first request, see _get_session
+        self._lock = threading.Lock()  # Guards the dicts above and below, never held over HTTP
+        self._fetch_locks = {}  # (grant_type, scope) -> Lock serializing fetches of that key
+        self._refresh_timers = {}  # (grant_type, scope) -> pending threading.Timer
+        self._read_since_fetch = set()  # Keys served from cache since their last fetch
+        self._closed = False  # Set by close(), stops any further token requests
+
+    def _get_session(self):
+        """Pooled session for the token endpoint, requests is imported on first use"""
+        with self._lock:
+            # A session created after close() would never be released
+            if self._closed:
+                raise RuntimeError("OAuth2Manager is closed")
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                # Keep connections to the token endpoint alive between requests
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                      max_retries=Retry(total=2, backoff_factor=0.2))
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    def close(self):
+        """Cancel background refreshes and release pooled connections, no tokens can be requested afterwards"""
+        with self._lock:
+            self._closed = True
+            for timer in self._refresh_timers.values():
+                timer.cancel()
+            self._refresh_timers.clear()
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _request_token(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._get_session().post(self.token_url, data=data, headers=self._token_headers, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    def get_oauth_token(self, grant_type: str = "client_credentials", scope: str = "") -> Dict[str, Any]:
+        """Get an access token, reusing the cached one until it is close to expiry"""
+        key = (grant_type, scope or "")
+
+        with self._lock:
+            cached = self._get_cached(key)
+            if cached is not None:
+                return dict(cached)
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        # Only fetches of the same key wait on each other
+        with fetch_lock:
+            with self._lock:
+                cached = self._get_cached(key)
+            if cached is None:
+                cached = self._fetch_token(key)
+
+        return dict(cached)
+
+    def _get_cached(self, key):
+        """Cached token for key if it is still fresh (caller holds _lock)"""
+        if key in self._cached_token and time.time() < self._token_expires_at[key] - TOKEN_EXPIRY_SKEW:
+            self._read_since_fetch.add(key)
+            return self._cached_token[key]
+        return None
+
+    def _fetch_token(self, key) -> Dict[str, Any]:
+        """Request a token for key, cache it and schedule its refresh (caller holds the key's fetch lock)"""
+        grant_type, scope = key
+        data = {"grant_type": grant_type}
+        if scope:
+            data["scope"] = scope
+
+        now = time.time()
+        result = self._request_token(data)
+        expires_in = int(result.get("expires_in", 3600))
+
+        with self._lock:
+            # close() ran while the request was in flight
+            if self._closed:
+                return result
+            self._cached_token[key] = result
+            self._token_expires_at[key] = now + expires_in
+            self._read_since_fetch.discard(key)
+            self._schedule_refresh(key, expires_in - BACKGROUND_REFRESH_LEAD)
+        return result
+
+    def _schedule_refresh(self, key, delay: float):
+        """Replace the pending refresh timer for key (caller holds _lock)"""
+        timer = self._refresh_timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        if delay > 0:
+            timer = threading.Timer(delay, self._background_refresh, args=(key,))
+            timer.daemon = True
+            self._refresh_timers[key] = timer
+            timer.start()
+
+    def _background_refresh(self, key):
+        with self._lock:
+            # close() cancelled this timer after it had already fired
+            if key not in self._refresh_timers:
+                return
+            del self._refresh_timers[key]
+            # Nobody used the token since it was fetched, so let it lapse
+            # and let the next get_oauth_token call fetch on demand
+            if key not in self._read_since_fetch:
+                return
+            fetch_lock = self._fetch_locks.setdefault(key, threading.Lock())
+
+        # Callers holding a fresh token keep reading it while this request is in flight
+        with fetch_lock:
+            with self._lock:
+                # close() ran while this refresh waited for the fetch lock
+                if self._closed:
+                    return
+            try:
+                self._fetch_token(key)
+            except Exception:
+                # Leave it to the next get_oauth_token call to fetch on demand
+                pass
+
+    def refresh_oauth_token(self, refresh_token: str) -> Dict[str, Any]:
+        """Exchange a refresh token for a new access token"""
+        return self._request_token({
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token
+        })
@@ -0,0 +1,30 @@
+"""
+JSON encoding for tool responses and the config file
+Uses orjson when it is installed and falls back to the standard library
+"""
+try:
+    import orjson
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+    def dumps_compact(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    # Indented bytes for files opened in binary mode
+    def dumps_bytes(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+except ImportError:
+    import json
+
+    def dumps(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+    dumps_compact = json.dumps
+
+    def dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+    loads = json.loads
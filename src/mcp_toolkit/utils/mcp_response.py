@@ -0,0 +1,31 @@
+"""
+Shared MCP response envelopes for tool collections
+"""
+import functools
+
+def text_response(text: str, is_error: bool = False, meta: dict = None) -> dict:
+    """Wrap text in the MCP tool response envelope"""
+    response = {"content": [{"type": "text", "text": text}]}
+    if is_error:
+        response["isError"] = True
+    if meta is not None:
+        response["meta"] = meta
+    return response
+
+def mcp_error_envelope(suggestion: str = None):
+    """Turn exceptions raised by a tool handler into an MCP error response
+
+    The handler's collection must provide a _dumps encoder.
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(self, arguments):
+            try:
+                return handler(self, arguments)
+            except Exception as e:
+                error = {"error": str(e)}
+                if suggestion:
+                    error["suggestion"] = suggestion
+                return text_response(self._dumps(error), is_error=True)
+        return wrapper
+    return decorator
@@ -0,0 +1,181 @@
+"""
+Tests for the OAuth token client and the auth tool collection's manager cache
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mcp_toolkit.core.config_manager import ConfigManager
+from mcp_toolkit.tools import auth_tools, oauth_manager
+from mcp_toolkit.tools.auth_tools import AuthToolsCollection
+from mcp_toolkit.tools.oauth_manager import OAuth2Manager, TOKEN_EXPIRY_SKEW
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return dict(self._payload)
+
+class FakeSession:
+    """Stands in for requests.Session, hands out numbered tokens"""
+    def __init__(self, expires_in=3600):
+        self.expires_in = expires_in
+        self.requests = []
+        self.closed = False
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        self.requests.append(data)
+        return FakeResponse({
+            "access_token": f"token-{len(self.requests)}",
+            "expires_in": self.expires_in
+        })
+
+    def close(self):
+        self.closed = True
+
+class OAuth2ManagerTokenCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.session = FakeSession()
+        self.manager = OAuth2Manager("client", "secret", "https://auth.test/token")
+        self.manager._session = self.session
+        self.now = 1_000_000.0
+        patcher = mock.patch.object(oauth_manager.time, "time", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.manager.close)
+
+    def test_cached_token_reused_before_expiry_skew(self):
+        first = self.manager.get_oauth_token("client_credentials", "read")
+        self.now += 3600 - TOKEN_EXPIRY_SKEW - 1
+        second = self.manager.get_oauth_token("client_credentials", "read")
+
+        self.assertEqual(first["access_token"], "token-1")
+        self.assertEqual(second["access_token"], "token-1")
+        self.assertEqual(len(self.session.requests), 1)
+
+    def test_token_refetched_after_expiry_skew(self):
+        self.manager.get_oauth_token("client_credentials", "read")
+        self.now += 3600 - TOKEN_EXPIRY_SKEW
+        result = self.manager.get_oauth_token("client_credentials", "read")
+
+        self.assertEqual(result["access_token"], "token-2")
+        self.assertEqual(len(self.session.requests), 2)
+
+    def test_scopes_cached_separately(self):
+        read = self.manager.get_oauth_token("client_credentials", "read")
+        write = self.manager.get_oauth_token("client_credentials", "write")
+
+        self.assertNotEqual(read["access_token"], write["access_token"])
+        self.assertEqual(self.manager.get_oauth_token("client_credentials", "read"), read)
+        self.assertEqual(self.manager.get_oauth_token("client_credentials", "write"), write)
+        self.assertEqual([r["scope"] for r in self.session.requests], ["read", "write"])
+
+    def test_returned_token_is_a_copy(self):
+        result = self.manager.get_oauth_token("client_credentials", "read")
+        result["environment"] = "staging"
+
+        self.assertNotIn("environment", self.manager.get_oauth_token("client_credentials", "read"))
+
+    def test_close_cancels_refresh_timers(self):
+        self.manager.get_oauth_token("client_credentials", "read")
+        timer = self.manager._refresh_timers[("client_credentials", "read")]
+
+        self.manager.close()
+
+        self.assertTrue(timer.finished.is_set())
+        self.assertEqual(self.manager._refresh_timers, {})
+        self.assertTrue(self.session.closed)
+
+    def test_background_refresh_skips_unread_token(self):
+        key = ("client_credentials", "read")
+        self.manager.get_oauth_token(*key)
+        self.manager._background_refresh(key)
+        self.assertEqual(len(self.session.requests), 1)
+
+        self.manager.get_oauth_token(*key)
+        self.manager._refresh_timers[key] = mock.Mock()
+        self.manager._background_refresh(key)
+        self.assertEqual(len(self.session.requests), 2)
+
+    def test_background_refresh_after_close_makes_no_request(self):
+        key = ("client_credentials", "read")
+        self.manager.get_oauth_token(*key)
+        self.manager.get_oauth_token(*key)
+
+        # close() lands while the refresh is waiting for the fetch lock
+        closing_lock = mock.MagicMock()
+        closing_lock.__enter__.side_effect = lambda: self.manager.close()
+        self.manager._fetch_locks[key] = closing_lock
+        self.manager._background_refresh(key)
+
+        self.assertEqual(len(self.session.requests), 1)
+        self.assertIsNone(self.manager._session)
+        with self.assertRaises(RuntimeError):
+            self.manager.get_oauth_token("client_credentials", "write")
+        self.assertIsNone(self.manager._session)
+
+class OAuthConfigValidationTests(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.config_manager = ConfigManager(os.path.join(tmp_dir.name, "mcp_config.json"))
+
+    def test_in_place_edit_is_revalidated(self):
+        with self.assertRaisesRegex(ValueError, "needs these fields configured"):
+            self.config_manager.get_oauth_config("staging")
+
+        oauth = self.config_manager.config["environments"]["staging"]["oauth"]
+        oauth.update(client_id="staging-client", client_secret="staging-secret",
+                     token_url="https://staging.auth.test/token")
+        self.assertIs(self.config_manager.get_oauth_config("staging"), oauth)
+
+        oauth["client_secret"] = ""
+        with self.assertRaisesRegex(ValueError, r"\['client_secret'\]"):
+            self.config_manager.get_oauth_config("staging")
+
+class AuthManagerCacheTests(unittest.TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.config_manager = ConfigManager(os.path.join(tmp_dir.name, "mcp_config.json"))
+        self.config_manager.config["environments"] = {
+            env: {"oauth": {
+                "client_id": f"{env}-client",
+                "client_secret": f"{env}-secret",
+                "token_url": f"https://{env}.auth.test/token"
+            }}
+            for env in ("one", "two", "three")
+        }
+        self.tools = AuthToolsCollection(self.config_manager)
+
+    def test_lru_eviction_closes_manager(self):
+        with mock.patch.object(auth_tools, "MAX_AUTH_MANAGERS", 2), \
+                mock.patch.object(OAuth2Manager, "close", autospec=True) as close:
+            one, _ = self.tools._get_auth_manager("one")
+            self.tools._get_auth_manager("two")
+            self.tools._get_auth_manager("one")  # "two" is now least recently used
+            two = self.tools._auth_managers["two"][0]
+            self.tools._get_auth_manager("three")
+
+            close.assert_called_once_with(two)
+            self.assertEqual(list(self.tools._auth_managers), ["one", "three"])
+            self.assertIs(self.tools._auth_managers["one"][0], one)
+
+    def test_close_closes_every_manager(self):
+        managers = [self.tools._get_auth_manager(env)[0] for env in ("one", "two")]
+        with mock.patch.object(OAuth2Manager, "close", autospec=True) as close:
+            self.tools.close()
+
+        self.assertEqual([c.args[0] for c in close.call_args_list], managers)
+        self.assertEqual(len(self.tools._auth_managers), 0)
+
+if __name__ == "__main__":
+    unittest.main()